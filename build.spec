@@ -6,7 +6,7 @@ a = Analysis(
     ['main.py'],  # 파이썬 파일 이름 (다를 경우 수정하세요)
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('tray.png', '.')],  # 트레이 아이콘
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
@@ -1,20 +1,67 @@
 import sys
+import os
 import math
 import socket
 import json
-from collections import deque
+import threading
+import numpy as np
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    # orjson이 없으면 표준 json 사용 (memoryview는 bytes로 바꿔서 전달)
+    def _json_loads(data):
+        return json.loads(bytes(data))
+try:
+    from numba import njit
+except ImportError:
+    # numba가 없으면 JIT 없이 순수 파이썬으로 동작
+    def njit(*args, **kwargs):
+        return lambda func: func
 from PySide6.QtWidgets import (QApplication, QMainWindow, QSystemTrayIcon, 
                                QMenu, QWidget)
-from PySide6.QtCore import Qt, QTimer, QPointF, QThread, Signal
-from PySide6.QtGui import QPainter, QBrush, QColor, QAction, QIcon, QPixmap, QActionGroup, QTransform
+from PySide6.QtCore import Qt, QTimer, QThread
+from PySide6.QtGui import QPainter, QBrush, QColor, QAction, QIcon, QActionGroup, QTransform, QRegion
 
 # --- 기본 설정 ---
 PORT = 8989
-GYRO_SENSITIVITY = 40.0 
-ACCEL_SENSITIVITY = 150.0
+# 센서 계산은 전부 float32 (IMU 해상도에 float64 정밀도는 불필요)
+GYRO_SENSITIVITY = np.float32(40.0)
+ACCEL_SENSITIVITY = np.float32(150.0)
 
 # [수정] 줌 민감도: 가속도 변화에 민감하게 반응하도록 설정
-ZOOM_SENSITIVITY = 0.5 
+ZOOM_SENSITIVITY = np.float32(0.5)
+# 줌 범위 (최대값은 중앙 다시 그리기 생략 영역 크기 계산에도 사용)
+MIN_SCALE = 0.5
+MAX_SCALE = 3.0
+
+GRID_SPACING = 130
+
+# 타이머 주기 (60Hz). _tick의 적응/감쇠 계수는 틱 단위이므로 정지 상태에서도 주기는 바꾸지 않음
+TICK_INTERVAL_MS = 16
+
+# 저역 통과 필터: 폰 앱은 20ms 간격(50Hz)으로 전송
+SAMPLE_DT = 0.02
+LOWPASS_CUTOFF_HZ = 4.0
+
+# PyInstaller로 묶인 exe에서는 소스 파일 옆에 JIT 캐시를 쓸 수 없음
+JIT_CACHE = not getattr(sys, 'frozen', False)
+
+# 물리 상태 배열(state)의 인덱스
+(S_POS_X, S_POS_Y, S_ROT, S_SCALE, S_OPACITY, S_TARGET_OPACITY,
+ S_BIAS_GY, S_BIAS_ANGLE, STATE_SIZE) = range(9)
+
+# 필터 출력 배열(filtered)의 채널 순서
+F_AX, F_AY, F_AZ, F_GY = range(4)
+
+# 회전한 화면(외접 사각형 한 변 rotated)을 덮기 위해 그리드를 size 바깥으로 늘릴 여유분
+# 그리드가 흔들리지 않도록 항상 spacing의 정수배로 올림 (rotated < size이면 음수가 될 수 있어 ceil 사용)
+def grid_margin(rotated, size, spacing):
+    return (math.ceil((rotated - size) / 2 / spacing) + 1) * spacing
+
+# 1차 IIR 저역 통과 필터 계수 (y += alpha * (x - y))
+def calc_lowpass_alpha_dt(dt, cutoff_hz):
+    return 1.0 - math.exp(-2.0 * math.pi * cutoff_hz * dt)
 
 def get_ip():
     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -27,13 +74,164 @@ def get_ip():
         s.close()
     return IP
 
-class UdpServerThread(QThread):
-    data_received = Signal(float, float, float, float, float, float)
+# 매 프레임(16ms) 호출되는 물리 계산. state, bias_a 배열을 제자리에서 갱신
+@njit(cache=JIT_CACHE, fastmath=True)
+def _tick(state, filtered, bias_a, gyro_sens, accel_sens, zoom_sens):
+    # === 1. 동적 Bias 업데이트 (High-Pass Filter) ===
+    # 가속도(A)의 기준점(Bias)이 현재 값(f_a)을 아주 천천히 따라갑니다.
+    # 효과: 폰을 기울인 채로 가만히 있으면, 그 상태가 새로운 0점이 됩니다.
+    # 0.02는 따라가는 속도 (값이 클수록 빨리 0점으로 돌아옴)
+    adaptation_rate = 0.02
+    accel = filtered[:3]
+    bias_a += adaptation_rate * (accel - bias_a)
+
+    # 현재값 - 유동적 Bias (멈추면 0이 됨) 후 데드존 적용, 3축(ax, ay, az)을 한 번에 처리
+    diff = accel - bias_a
+    diff[np.abs(diff) < 0.1] = 0.0
+    diff_ay = diff[1]
+    diff_az = diff[2]
+
+    # === 2. 횡이동 (Gyro Y 적분) ===
+    # 자이로는 절대 위치가 없으므로 고정 Bias를 사용하되, 데드존을 세게 줍니다.
+    gyro_y = filtered[F_GY] - state[S_BIAS_GY]
+
+    # [수정] 데드존 강화: 0.08 미만의 회전은 무시 (멈췄을 때 흐르는 현상 방지)
+    if abs(gyro_y) < 0.08:
+        gyro_y = 0.0
+
+    # 그리드는 GRID_SPACING 주기로 반복되므로 위치도 그 범위로 접어 둠 (float32 정밀도 유지)
+    state[S_POS_X] = (state[S_POS_X] + gyro_y * gyro_sens) % GRID_SPACING
+
+    # === 3. 상하 이동 (Accel Y) ===
+    state[S_POS_Y] = diff_ay * accel_sens
+
+    # === 4. 화면 회전 (Roll) ===
+    # 거의 수평일 때(|ax| < 0.3 * ay)는 atan(r) ~= r - r^3/3 로 atan2를 생략 (오차 0.03° 미만)
+    f_ax = filtered[F_AX]
+    f_ay = filtered[F_AY]
+    if f_ay > 0.0 and abs(f_ax) < 0.3 * f_ay:
+        r = f_ax / f_ay
+        current_angle = (r - r * r * r / 3.0) * 57.29577951308232
+    else:
+        current_angle = math.degrees(math.atan2(f_ax, f_ay))
+
+    # 회전 기준 각도도 천천히 현재 각도를 따라가게 할지 결정해야 함.
+    # 여기서는 회전은 '절대 수평'을 유지하는 게 좋으므로 고정 Bias 유지 (오뚝이 효과)
+    angle_diff = current_angle - state[S_BIAS_ANGLE]
+    if abs(angle_diff) < 1.0: angle_diff = 0.0
+    state[S_ROT] = angle_diff * 1.2
+
+    # === 5. [수정] 스케일 (Zoom) ===
+    # 폰을 떨어뜨려서 Z축 가속도가 변해도, Bias가 따라가므로 diff_az는 곧 0이 됨 -> 크기 원복
+    # 목표 스케일 계산 (기본 1.0)
+    target_scale = 1.0 + (diff_az * zoom_sens)
+    target_scale = max(MIN_SCALE, min(MAX_SCALE, target_scale))
+
+    # 부드럽게 돌아가기 (Elasticity)
+    state[S_SCALE] += (target_scale - state[S_SCALE]) * 0.1
+
+    # === 6. 투명도 ===
+    motion = abs(gyro_y) + abs(diff_ay) + abs(diff_az * 2) + abs(angle_diff / 10.0)
+
+    if motion > 0.15:
+        state[S_TARGET_OPACITY] = min(1.0, (motion - 0.15) / 0.8) + 0.2
+    else:
+        state[S_TARGET_OPACITY] = 0.0
+
+    state[S_OPACITY] += (state[S_TARGET_OPACITY] - state[S_OPACITY]) * 0.1
+
+# 그리드 점 계산 커널: 컬링을 통과한 점의 외접 사각형(left, top, 지름)과 알파값을
+# 미리 할당된 출력 배열에 채우고 개수를 반환 (NumPy 임시 배열 없이 한 번의 루프)
+@njit(cache=JIT_CACHE, fastmath=True)
+def _dot_kernel(x_start, y_start, nx, ny, spacing, cx, cy, cos_t, sin_t,
+                safe_zone, max_d_sub_safe, opacity, scale, pad,
+                out_left, out_top, out_diam, out_alpha):
+    safe_sq = safe_zone * safe_zone
+    lim_x = cx + pad
+    lim_y = cy + pad
+    n = 0
+    for j in range(ny):
+        y = y_start + j * spacing
+        dy = y - cy
+
+        # 이 행이 Safe Zone 원을 지나면 원 안쪽 구간 [cx - hx, cx + hx]의 열은 아예 건너뜀
+        # (행마다 sqrt 한 번으로 셀별 거리 비교를 대신함)
+        i_left = nx
+        i_right = nx
+        rem = safe_sq - dy * dy
+        if rem > 0.0:
+            hx = math.sqrt(rem)
+            i_left = min(nx, max(0, int(math.floor((cx - hx - x_start) / spacing)) + 1))
+            i_right = min(nx, max(i_left, int(math.ceil((cx + hx - x_start) / spacing))))
+
+        for seg in range(2):
+            if seg == 0:
+                i0 = 0
+                i1 = i_left
+            else:
+                i0 = i_right
+                i1 = nx
+            for i in range(i0, i1):
+                # 출력 버퍼가 가득 차면 중단 (numba는 범위를 검사하지 않으므로 넘치면 메모리가 깨짐)
+                if n == out_left.shape[0]: return n
+
+                x = x_start + i * spacing
+                dx = x - cx
+
+                # 회전 후 화면 밖이면 건너뜀
+                if abs(cos_t * dx - sin_t * dy) > lim_x: continue
+                if abs(sin_t * dx + cos_t * dy) > lim_y: continue
+
+                d2 = dx * dx + dy * dy
+                ratio = (math.sqrt(d2) - safe_zone) / max_d_sub_safe
+                if ratio > 1.0: ratio = 1.0
+                elif ratio < 0.0: ratio = 0.0
 
+                alpha = int(opacity * ratio * 180)
+                if alpha < 10: continue
+                if alpha > 255: alpha = 255
+
+                # 점은 반지름 size인 원
+                size = (6 + ratio * 8) * scale
+                out_left[n] = int(math.floor(x - size + 0.5))
+                out_top[n] = int(math.floor(y - size + 0.5))
+                out_diam[n] = int(math.floor(2 * size + 0.5))
+                out_alpha[n] = alpha
+                n += 1
+    return n
+
+# UDP 스레드 -> UI 스레드 샘플 전달용 링 버퍼
+# 패킷마다 시그널을 보내지 않고, 타이머 틱마다 쌓인 샘플을 한 번에 꺼내 감
+# 화면 갱신이 밀리면 가장 오래된 샘플부터 덮어씀
+class SampleRing:
+    def __init__(self, size=64):
+        self.size = size
+        self.buf = np.zeros((size, 6), dtype=np.float32)
+        self.head = 0  # 지금까지 기록된 샘플 수
+        self.tail = 0  # 지금까지 꺼내 간 샘플 수
+        self.lock = threading.Lock()
+
+    def push(self, gx, gy, gz, ax, ay, az):
+        with self.lock:
+            self.buf[self.head % self.size] = (gx, gy, gz, ax, ay, az)
+            self.head += 1
+
+    def drain(self):
+        with self.lock:
+            n = min(self.head - self.tail, self.size)
+            if n == 0:
+                return []
+            idx = np.arange(self.head - n, self.head) % self.size
+            samples = self.buf[idx].tolist()
+            self.tail = self.head
+        return samples
+
+class UdpServerThread(QThread):
     def __init__(self):
         super().__init__()
         self.running = True
         self.sock = None
+        self.samples = SampleRing()
 
     def run(self):
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -42,23 +240,22 @@ class UdpServerThread(QThread):
         except Exception:
             return
 
+        # 수신 버퍼는 한 번만 만들고 매 패킷마다 재사용
+        buf = bytearray(1024)
+        view = memoryview(buf)
+
         while self.running:
             try:
-                data, addr = self.sock.recvfrom(1024)
-                text = data.decode('utf-8').strip()
-                jd = json.loads(text)
-                
-                # 소수점 2째 자리 반올림 (양자화) - 노이즈 1차 제거
-                def quantize(val):
-                    return round(float(val), 2)
-
-                self.data_received.emit(
-                    quantize(jd.get('gx', 0.0)), 
-                    quantize(jd.get('gy', 0.0)), 
-                    quantize(jd.get('gz', 0.0)),
-                    quantize(jd.get('ax', 0.0)), 
-                    quantize(jd.get('ay', 0.0)), 
-                    quantize(jd.get('az', 0.0))
+                # 송신 주소는 쓰지 않으므로 recv_into로 주소 튜플 생성도 생략
+                n = self.sock.recv_into(buf)
+                jd = _json_loads(view[:n])
+
+                # 가속도(ax/ay/az)만 보내는 송신 앱도 있으므로 자이로 키는 없으면 0.0
+                # float32 링 버퍼에 기록하면서 변환되므로 float() 호출도 생략
+                get = jd.get
+                self.samples.push(
+                    get('gx', 0.0), get('gy', 0.0), get('gz', 0.0),
+                    jd['ax'], jd['ay'], jd['az']
                 )
             except:
                 pass
@@ -88,6 +285,39 @@ class MotionOverlay(QMainWindow):
         self.center_x = self.width_limit / 2
         self.center_y = self.height_limit / 2
         self.diag_len = math.hypot(self.width_limit, self.height_limit)
+        self.safe_zone = min(self.width_limit, self.height_limit) * 0.35
+        self.max_d_sub_safe = (self.diag_len / 2) - self.safe_zone
+
+        # 점은 Safe Zone 바깥에만 그려지므로 회전과 무관하게 항상 비어 있는
+        # 중앙 정사각형(가장 큰 점 크기만큼 여유)은 매 프레임 다시 그리지 않음
+        self.max_dot = (6 + 8) * MAX_SCALE
+        half = int(self.safe_zone / math.sqrt(2) - 2 * self.max_dot)
+        self._dirty_region = QRegion(0, 0, self.width_limit, self.height_limit)
+        if half > 0:
+            self._dirty_region -= QRegion(int(self.center_x) - half, int(self.center_y) - half,
+                                          2 * half, 2 * half)
+
+        # 알파값별 브러시와 변환 행렬은 한 번만 만들어 매 프레임 재사용
+        self._brushes = [QBrush(QColor(220, 220, 220, a)) for a in range(256)]
+        self._transform = QTransform()
+
+        # 점 계산 커널 출력 버퍼: 회전한 화면의 외접 사각형은 대각선 길이를 넘지 않으므로
+        # paintEvent와 같은 여유분 계산에 대각선을 넣은 최악의 그리드 크기만큼 한 번만 할당
+        # (start_x/start_y 오프셋으로 한 칸, 나눗셈 올림으로 한 칸 더)
+        w = self.width_limit
+        h = self.height_limit
+        max_nx = (w + 2 * grid_margin(self.diag_len, w, GRID_SPACING)) // GRID_SPACING + 2
+        max_ny = (h + 2 * grid_margin(self.diag_len, h, GRID_SPACING)) // GRID_SPACING + 2
+        max_cells = int(max_nx * max_ny)
+        self._dot_left = np.zeros(max_cells, dtype=np.int32)
+        self._dot_top = np.zeros(max_cells, dtype=np.int32)
+        self._dot_diam = np.zeros(max_cells, dtype=np.int32)
+        self._dot_alpha = np.zeros(max_cells, dtype=np.int32)
+
+        # 첫 프레임에 컴파일로 멈추지 않도록 paintEvent와 같은 타입(int, float, int32 배열)으로 미리 컴파일
+        _dot_kernel(0, 0, 0, 0, GRID_SPACING, self.center_x, self.center_y, 1.0, 0.0,
+                    self.safe_zone, self.max_d_sub_safe, 0.0, 1.0, 2 * self.max_dot,
+                    self._dot_left, self._dot_top, self._dot_diam, self._dot_alpha)
 
         self.pos_x = 0.0
         self.pos_y = 0.0
@@ -100,36 +330,33 @@ class MotionOverlay(QMainWindow):
         self.is_calibrating = True
         self.calib_data = []
         
+        # 물리 계산 상태 (위치/회전/스케일/투명도, Bias, 필터 출력)
+        self.state = np.zeros(STATE_SIZE, dtype=np.float32)
+        self.state[S_SCALE] = 1.0
+
         # [핵심] 기준값(Bias) 변수
         # 자이로(회전)는 고정된 기준값을 씁니다. (내가 멈추면 값도 0이어야 함)
-        self.bias_gy = 0.0
-        
         # 가속도(위치/크기)는 '유동적 기준값'을 씁니다. (상황에 따라 0점이 변함)
         # 이를 통해 폰을 떨어뜨려도 잠시 후엔 그 상태가 0점이 됩니다.
-        self.running_bias_ax = 0.0
-        self.running_bias_ay = 9.8
-        self.running_bias_az = 0.0
-        self.bias_angle = 0.0
-
-        # 이동 평균 필터 버퍼
-        self.window_size = 6
-        self.buf_ax = deque(maxlen=self.window_size)
-        self.buf_ay = deque(maxlen=self.window_size)
-        self.buf_az = deque(maxlen=self.window_size)
-        self.buf_gy = deque(maxlen=self.window_size)
-        
-        self.f_ax = 0.0
-        self.f_ay = 0.0
-        self.f_az = 0.0
-        self.f_gy = 0.0
+        self.bias_a = np.array([0.0, 9.8, 0.0], dtype=np.float32)
+
+        # 저역 통과 필터 (ax, ay, az, gy 4채널)
+        self.alpha_lp = calc_lowpass_alpha_dt(SAMPLE_DT, LOWPASS_CUTOFF_HZ)
+        self.filtered = np.zeros(4, dtype=np.float32)
+        self._sample = np.zeros(4, dtype=np.float32)
+
+        # JIT 컴파일은 첫 호출 때 일어나므로, 보정 직후 첫 틱이 멈추지 않도록
+        # 실제와 같은 타입의 더미 인자로 미리 한 번 호출해 둠 (exe에서는 캐시가 없어 매번 필요)
+        _tick(self.state.copy(), self.filtered.copy(), self.bias_a.copy(),
+              GYRO_SENSITIVITY, ACCEL_SENSITIVITY, ZOOM_SENSITIVITY)
 
         self.server = UdpServerThread()
-        self.server.data_received.connect(self.on_sensor_data)
         self.server.start()
 
+        self._was_idle = False
         self.timer = QTimer()
         self.timer.timeout.connect(self.update_physics)
-        self.timer.start(16) 
+        self.timer.start(TICK_INTERVAL_MS)
 
     def start_calibration(self):
         self.calib_data = []
@@ -138,7 +365,7 @@ class MotionOverlay(QMainWindow):
 
     def set_gyro_sensitivity(self, value):
         global GYRO_SENSITIVITY
-        GYRO_SENSITIVITY = value * 10.0
+        GYRO_SENSITIVITY = np.float32(value * 10.0)
 
     def on_sensor_data(self, gx, gy, gz, ax, ay, az):
         # 1. 초기 보정
@@ -148,92 +375,58 @@ class MotionOverlay(QMainWindow):
                 avgs = [sum(col) / len(col) for col in zip(*self.calib_data)]
                 
                 # 자이로 Bias는 고정 (회전 멈춤을 0으로 인식)
-                self.bias_gy = avgs[1] 
+                self.state[S_BIAS_GY] = avgs[1] 
                 
                 # 가속도 Bias는 초기값 설정 후 계속 변함
-                self.running_bias_ax = avgs[3]
-                self.running_bias_ay = avgs[4]
-                self.running_bias_az = avgs[5]
+                self.bias_a[:] = avgs[3:6]
+
+                # 필터 출력도 보정값에서 시작 (0에서 천천히 올라오는 현상 방지)
+                self.filtered[:] = (avgs[3], avgs[4], avgs[5], avgs[1])
                 
-                self.bias_angle = math.degrees(math.atan2(avgs[3], avgs[4]))
+                self.state[S_BIAS_ANGLE] = math.degrees(math.atan2(avgs[3], avgs[4]))
                 self.is_calibrating = False
                 print("✅ 보정 완료")
+                # 중앙의 "보정 중..." 문구까지 지우도록 전체 다시 그리기
+                self.update()
             return
 
-        # 2. 이동 평균 필터 (노이즈 제거)
-        self.buf_ax.append(ax)
-        self.buf_ay.append(ay)
-        self.buf_az.append(az)
-        self.buf_gy.append(gy)
-
-        if len(self.buf_ax) >= self.window_size:
-            self.f_ax = sum(self.buf_ax) / len(self.buf_ax)
-            self.f_ay = sum(self.buf_ay) / len(self.buf_ay)
-            self.f_az = sum(self.buf_az) / len(self.buf_az)
-            self.f_gy = sum(self.buf_gy) / len(self.buf_gy)
+        # 2. 저역 통과 필터 (노이즈 제거): filtered += alpha * (x - filtered)
+        x = self._sample
+        x[:] = (ax, ay, az, gy)
+        x -= self.filtered
+        x *= self.alpha_lp
+        self.filtered += x
 
     def update_physics(self):
-        if self.is_calibrating: return
+        # UDP 스레드가 쌓아 둔 샘플을 이번 틱에 한꺼번에 필터로 반영
+        on_sensor_data = self.on_sensor_data
+        for sample in self.server.samples.drain():
+            on_sensor_data(*sample)
 
-        # === 1. 동적 Bias 업데이트 (High-Pass Filter) ===
-        # 가속도(A)의 기준점(Bias)이 현재 값(f_a)을 아주 천천히 따라갑니다.
-        # 효과: 폰을 기울인 채로 가만히 있으면, 그 상태가 새로운 0점이 됩니다.
-        # 0.02는 따라가는 속도 (값이 클수록 빨리 0점으로 돌아옴)
-        adaptation_rate = 0.02
-        self.running_bias_ax = self.running_bias_ax * (1 - adaptation_rate) + self.f_ax * adaptation_rate
-        self.running_bias_ay = self.running_bias_ay * (1 - adaptation_rate) + self.f_ay * adaptation_rate
-        self.running_bias_az = self.running_bias_az * (1 - adaptation_rate) + self.f_az * adaptation_rate
-
-        # === 2. 횡이동 (Gyro Y 적분) ===
-        # 자이로는 절대 위치가 없으므로 고정 Bias를 사용하되, 데드존을 세게 줍니다.
-        gyro_y = self.f_gy - self.bias_gy
-        
-        # [수정] 데드존 강화: 0.08 미만의 회전은 무시 (멈췄을 때 흐르는 현상 방지)
-        if abs(gyro_y) < 0.08: 
-            gyro_y = 0.0
-            
-        self.pos_x += gyro_y * GYRO_SENSITIVITY
-
-        # === 3. 상하 이동 (Accel Y) ===
-        # 현재값 - 유동적 Bias (멈추면 0이 됨)
-        diff_ay = self.f_ay - self.running_bias_ay
-        if abs(diff_ay) < 0.1: diff_ay = 0.0 
-        self.pos_y = diff_ay * ACCEL_SENSITIVITY
-
-        # === 4. 화면 회전 (Roll) ===
-        current_angle = math.degrees(math.atan2(self.f_ax, self.f_ay))
-        
-        # 회전 기준 각도도 천천히 현재 각도를 따라가게 할지 결정해야 함.
-        # 여기서는 회전은 '절대 수평'을 유지하는 게 좋으므로 고정 Bias 유지 (오뚝이 효과)
-        angle_diff = current_angle - self.bias_angle
-        if abs(angle_diff) < 1.0: angle_diff = 0.0
-        self.rotation_angle = angle_diff * 1.2
-
-        # === 5. [수정] 스케일 (Zoom) ===
-        # 현재값 - 유동적 Bias
-        # 폰을 떨어뜨려서 Z축 가속도가 변해도, Bias가 따라가므로 diff_az는 곧 0이 됨 -> 크기 원복
-        diff_az = self.f_az - self.running_bias_az
-        
-        # 데드존 적용
-        if abs(diff_az) < 0.1: diff_az = 0.0
+        if self.is_calibrating: return
 
-        # 목표 스케일 계산 (기본 1.0)
-        target_scale = 1.0 + (diff_az * ZOOM_SENSITIVITY)
-        target_scale = max(0.5, min(3.0, target_scale))
-        
-        # 부드럽게 돌아가기 (Elasticity)
-        self.scale_factor += (target_scale - self.scale_factor) * 0.1
+        st = self.state
+        _tick(st, self.filtered, self.bias_a, GYRO_SENSITIVITY, ACCEL_SENSITIVITY, ZOOM_SENSITIVITY)
+
+        # paintEvent에서 쓰는 값만 꺼내 둠
+        self.pos_x = float(st[S_POS_X])
+        self.pos_y = float(st[S_POS_Y])
+        self.rotation_angle = float(st[S_ROT])
+        self.scale_factor = float(st[S_SCALE])
+        self.current_opacity = float(st[S_OPACITY])
+        self.target_opacity = float(st[S_TARGET_OPACITY])
+
+        # 움직임이 없고 점이 이미 다 사라졌으면 다시 그리지 않음
+        # (물리 계산은 계속 60Hz로 돌아 Bias 추적과 자이로 적분은 그대로 유지)
+        if self.target_opacity == 0.0 and self.current_opacity < 0.02:
+            if not self._was_idle:
+                self._was_idle = True
+                # 마지막으로 그려진 점을 지우기 위해 한 번은 갱신
+                self.update(self._dirty_region)
+            return
 
-        # === 6. 투명도 ===
-        motion = abs(gyro_y) + abs(diff_ay) + abs(diff_az * 2) + abs(angle_diff / 10.0)
-        
-        if motion > 0.15:
-            self.target_opacity = min(1.0, (motion - 0.15) / 0.8) + 0.2
-        else:
-            self.target_opacity = 0.0
-            
-        self.current_opacity += (self.target_opacity - self.current_opacity) * 0.1
-        self.update()
+        self._was_idle = False
+        self.update(self._dirty_region)
 
     def paintEvent(self, event):
         if self.current_opacity < 0.02: return
@@ -251,62 +444,67 @@ class MotionOverlay(QMainWindow):
             painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "보정 중...")
             return
 
-        transform = QTransform()
-        transform.translate(self.center_x, self.center_y)
-        transform.rotate(self.rotation_angle) 
-        transform.translate(-self.center_x, -self.center_y)
-        painter.setTransform(transform)
-
-        grid_spacing = 130 
+        # 회전각의 sin/cos은 프레임당 한 번만 계산해 변환 행렬과 컬링에 같이 사용
+        theta = math.radians(self.rotation_angle)
+        cos_t = math.cos(theta)
+        sin_t = math.sin(theta)
+        cx = self.center_x
+        cy = self.center_y
+
+        # 중심 기준 회전: translate(c) * rotate * translate(-c) 를 직접 채움
+        self._transform.setMatrix(cos_t, sin_t, 0.0,
+                                  -sin_t, cos_t, 0.0,
+                                  cx - cos_t * cx + sin_t * cy,
+                                  cy - sin_t * cx - cos_t * cy, 1.0)
+        painter.setTransform(self._transform)
+
+        grid_spacing = GRID_SPACING
         start_x = (self.pos_x % grid_spacing) - grid_spacing
         start_y = (self.pos_y % grid_spacing) - grid_spacing
-        margin = int((self.diag_len - min(self.width_limit, self.height_limit)) / 2) + 100
-        
-        x_start = int(start_x) - margin
-        x_end = self.width_limit + margin
-        y_start = int(start_y) - margin
-        y_end = self.height_limit + margin
+
+        # 현재 회전각으로 돌린 화면을 덮는 만큼만 그리드를 확장 (대각선 최악값 대신)
+        # 여유분은 grid_spacing의 정수배라서 회전각이 바뀌어도 점 위치는 int(start_x/y)에 고정됨
+        abs_cos = abs(cos_t)
+        abs_sin = abs(sin_t)
+        w = self.width_limit
+        h = self.height_limit
+        margin_x = grid_margin(w * abs_cos + h * abs_sin, w, grid_spacing)
+        margin_y = grid_margin(w * abs_sin + h * abs_cos, h, grid_spacing)
         
-        safe_zone = min(self.width_limit, self.height_limit) * 0.35
-        max_d_sub_safe = (self.diag_len / 2) - safe_zone
+        x_start = int(start_x) - margin_x
+        x_end = w + margin_x
+        y_start = int(start_y) - margin_y
+        y_end = h + margin_y
         
-        brush_cache = {} 
-
-        for x in range(x_start, x_end, grid_spacing):
-            for y in range(y_start, y_end, grid_spacing):
-                dist = math.hypot(x - self.center_x, y - self.center_y)
-                if dist < safe_zone: continue
-
-                ratio = (dist - safe_zone) / max_d_sub_safe
-                if ratio > 1.0: ratio = 1.0
-                elif ratio < 0.0: ratio = 0.0
-
-                alpha = int(self.current_opacity * ratio * 180)
-                if alpha < 10: continue 
-
-                size = (6 + ratio * 8) * self.scale_factor
-
-                if alpha not in brush_cache:
-                    brush_cache[alpha] = QBrush(QColor(220, 220, 220, alpha))
-                
-                painter.setBrush(brush_cache[alpha])
-                painter.drawEllipse(QPointF(x - size/2, y - size/2), size, size)
+        nx = len(range(x_start, x_end, grid_spacing))
+        ny = len(range(y_start, y_end, grid_spacing))
+        n = _dot_kernel(x_start, y_start, nx, ny, grid_spacing, cx, cy, cos_t, sin_t,
+                        self.safe_zone, self.max_d_sub_safe,
+                        self.current_opacity, self.scale_factor, 2 * self.max_dot,
+                        self._dot_left, self._dot_top, self._dot_diam, self._dot_alpha)
+
+        left_k = self._dot_left[:n].tolist()
+        top_k = self._dot_top[:n].tolist()
+        diam_k = self._dot_diam[:n].tolist()
+        alpha_k = self._dot_alpha[:n].tolist()
+
+        # 루프 안의 속성 조회를 줄이기 위해 지역 이름으로 묶어 둠
+        brushes = self._brushes
+        set_brush = painter.setBrush
+        draw_ellipse = painter.drawEllipse
+
+        for left, top, diam, alpha in zip(left_k, top_k, diam_k, alpha_k):
+            set_brush(brushes[alpha])
+            draw_ellipse(left, top, diam, diam)
 
     def closeEvent(self, event):
         event.ignore()
         self.hide()
 
-# ... 트레이 아이콘 부분 (기존과 동일)
-def create_tray_icon_pixmap():
-    pixmap = QPixmap(64, 64)
-    pixmap.fill(Qt.transparent)
-    painter = QPainter(pixmap)
-    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-    painter.setBrush(QBrush(QColor(255, 105, 180)))
-    painter.setPen(Qt.PenStyle.NoPen)
-    painter.drawEllipse(8, 8, 48, 48)
-    painter.end()
-    return pixmap
+# 트레이 아이콘은 미리 만든 PNG를 읽어서 사용 (PyInstaller exe에서는 압축 해제 폴더 기준)
+def resource_path(name):
+    base = getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base, name)
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -315,7 +513,7 @@ if __name__ == "__main__":
     window = MotionOverlay()
     window.show()
 
-    tray_icon = QSystemTrayIcon(QIcon(create_tray_icon_pixmap()), app)
+    tray_icon = QSystemTrayIcon(QIcon(resource_path("tray.png")), app)
     tray_icon.setToolTip("Fixed World Overlay")
 
     menu = QMenu()